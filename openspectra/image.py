@@ -154,37 +154,41 @@ class BandImageAdjuster(ImageAdjuster):
                 self.low_cutoff(), self.high_cutoff(), self.__data_ignore_vale)
 
             if self.low_cutoff() != self.high_cutoff():
-                ignore_mask = None
-                if self.__data_ignore_vale is not None:
-                    ignore_mask = np.ma.getmask(np.ma.masked_equal(self.__band, self.__data_ignore_vale))
-                    # BandImageAdjuster.__LOG.debug("Created ignore value mask: {0}".format(ignore_mask))
-
-                # <= or <, looks like <=, with < there are strange dots on the image
-                low_mask = np.ma.getmask(np.ma.masked_where(self.__band <= self.__low_cutoff, self.__band, False))
-
-                # >= or <, looks like >=, with < I there are dots on the image
-                high_mask = np.ma.getmask(np.ma.masked_where(self.__band >= self.__high_cutoff, self.__band, False))
-
-                full_mask = low_mask | high_mask
-                masked_band = np.ma.masked_where(full_mask, self.__band, True)
+                # The display only needs the clipped values so scale and clip plain arrays
+                # in place rather than masking the values outside the cutoffs
+                if self.__type in OpenSpectraDataTypes.Floats:
+                    scaled_band = self.__band - self.__low_cutoff
+                else:
+                    scaled_band = np.subtract(self.__band, self.__low_cutoff, dtype=np.float64)
 
                 # 0 and 256 assumes 8-bit images, the pixel value limits
                 A, B = 0, 256
-                masked_band = ((masked_band - self.__low_cutoff) * ((B - A) / (self.__high_cutoff - self.__low_cutoff)) + A)
+                scaled_band *= (B - A) / (self.__high_cutoff - self.__low_cutoff)
+                scaled_band += A
+
+                # values at or below the low cutoff become black and values at or above the
+                # high cutoff become white, <= and >= avoid strange dots on the image
+                np.clip(scaled_band, A, B - 1, out=scaled_band)
 
-                # Set the low and high masked values to white and black
-                masked_band[low_mask] = 0
-                masked_band[high_mask] = 255
+                # with inverted cutoffs the band is thresholded, values at or
+                # above the high cutoff are white and everything else is black
+                if self.__low_cutoff > self.__high_cutoff:
+                    scaled_band[self.__band <= self.__low_cutoff] = A
+                    scaled_band[self.__band >= self.__high_cutoff] = B - 1
+
+                # nan isn't clipped, treat it as black
+                np.nan_to_num(scaled_band, copy=False)
 
                 # Set ignored values to black
-                if ignore_mask is not None and np.ma.is_mask(ignore_mask):
-                    # BandImageAdjuster.__LOG.debug("Applied ignore value mask: {0}".format(ignore_mask))
-                    masked_band[ignore_mask] = 0
+                if self.__data_ignore_vale is not None:
+                    scaled_band[self.__band == self.__data_ignore_vale] = 0
+
+                image_data = scaled_band.astype("uint8")
             else:
-                masked_band = np.ma.masked_not_equal(self.__band, 0)
-                masked_band[masked_band.mask] = 0
+                image_data = np.zeros(self.__band.shape, "uint8")
 
-            self.__image_data = masked_band.astype("uint8")
+            # nothing is masked but callers expect a masked array
+            self.__image_data = np.ma.masked_array(image_data)
             self.__updated = False
 
     def is_updated(self, band:Band=None) -> bool:
@@ -198,7 +202,16 @@ class BandImageAdjuster(ImageAdjuster):
         max = self.__band.max()
 
         # scale to generate histogram data
-        hist_scaled = np.floor((self.__band - min)/(max - min) * (nbins - 1))
+        hist_scaled = self.__band - min
+        hist_scaled /= (max - min)
+        hist_scaled *= (nbins - 1)
+        np.floor(hist_scaled, out=hist_scaled)
+
+        # The scaled values are whole bin numbers so when they fit use a small
+        # integer type, it gives the same percentiles with much less data to process
+        if np.isfinite(min) and np.isfinite(max) and max > min and nbins <= np.iinfo(np.int16).max:
+            hist_scaled = hist_scaled.astype(np.int16)
+
         scaled_low_cut, scaled_high_cut = np.percentile(hist_scaled, (lower, upper))
 
         self.__low_cutoff = (scaled_low_cut / (nbins - 1) * (max - min)) + min
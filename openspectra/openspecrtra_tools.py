@@ -32,6 +32,28 @@ class RegionOfInterest:
             raise ValueError(
                 "Parameter 'area' dimensions are not valid, expect the second dimension of the array to be 2")
 
+        self.__initialize(area[:, 0], area[:, 1], x_zoom_factor, y_zoom_factor,
+            image_height, image_width, descriptor, display_name, map_info)
+
+    @classmethod
+    def from_points(cls, x_points:np.ndarray, y_points:np.ndarray, x_zoom_factor:float, y_zoom_factor:float,
+            image_height:int, image_width:int, descriptor:Union[BandDescriptor, Dict[Band, BandDescriptor]],
+            display_name=None, map_info:OpenSpectraHeader.MapInfo=None) -> "RegionOfInterest":
+        """Create a region of interest from separate 1 dimensional arrays of x and y points.
+        Use this when the points are already separate rather than stacking them into an area
+        that the constructor will only split apart again"""
+
+        if x_points.ndim != 1 or y_points.ndim != 1:
+            raise ValueError("Parameters 'x_points' and 'y_points' are not valid, expect 1 dimensional arrays")
+
+        region = cls.__new__(cls)
+        region.__initialize(x_points, y_points, x_zoom_factor, y_zoom_factor,
+            image_height, image_width, descriptor, display_name, map_info)
+        return region
+
+    def __initialize(self, x_points:np.ndarray, y_points:np.ndarray, x_zoom_factor:float, y_zoom_factor:float,
+            image_height:int, image_width:int, descriptor:Union[BandDescriptor, Dict[Band, BandDescriptor]],
+            display_name, map_info:OpenSpectraHeader.MapInfo):
         # index to use when we're being iterated over
         self.__index = -1
         self.__display_name = display_name
@@ -48,16 +70,16 @@ class RegionOfInterest:
         else:
             self.__description = self.__descriptor.label()
 
-        # split the points back into x and y values and convert to 1 to 1 space and 0 based
+        # convert the points to 1 to 1 space and 0 based
         if x_zoom_factor != 1.0:
-            self.__x_points = np.floor(area[:, 0] / x_zoom_factor).astype(np.int16)
+            self.__x_points = RegionOfInterest.__scale_points(x_points, x_zoom_factor)
         else:
-            self.__x_points = area[:, 0]
+            self.__x_points = x_points
 
         if y_zoom_factor != 1.0:
-            self.__y_points = np.floor(area[:, 1] / y_zoom_factor).astype(np.int16)
+            self.__y_points = RegionOfInterest.__scale_points(y_points, y_zoom_factor)
         else:
-            self.__y_points = area[:, 1]
+            self.__y_points = y_points
 
         if self.__x_points.size != self.__y_points.size:
             raise ValueError("Number of x points doesn't match number of y points")
@@ -77,6 +99,22 @@ class RegionOfInterest:
         self.__map_info:OpenSpectraHeader.MapInfo = map_info
         self.__calculate_coords()
 
+    @staticmethod
+    def __scale_points(points:np.ndarray, zoom_factor:float) -> np.ndarray:
+        points = np.asarray(points)
+
+        # integer points with a whole number zoom factor can use integer floor
+        # division, it's exact and avoids the floating point temporary array
+        if np.issubdtype(points.dtype, np.integer) and float(zoom_factor).is_integer():
+            return np.floor_divide(points, int(zoom_factor)).astype(np.intp, copy=False)
+
+        # divide and then floor in place rather than creating another temporary array.
+        # Don't use // here, floating point floor division isn't always the same as
+        # floor(divide), for example 3 // 0.1 is 29 not 30
+        scaled_points = np.divide(points, zoom_factor, dtype=np.float64)
+        np.floor(scaled_points, out=scaled_points)
+        return scaled_points.astype(np.intp)
+
     def __iter__(self):
         # make sure index is at -1
         self.__index = -1
@@ -123,6 +161,19 @@ class RegionOfInterest:
     def y_points(self) -> np.ndarray:
         return self.__y_points
 
+    def points_array(self) -> np.ndarray:
+        """get all of the points as [x, y] pairs, that is an array with a shape
+        of (num pixels, 2).  Prefer this to iterating over large regions"""
+        return np.column_stack((self.__x_points, self.__y_points))
+
+    def coords_array(self) -> np.ndarray:
+        """get all of the coordinates as [x, y] pairs, that is an array with a shape
+        of (num pixels, 2).  Returns None if there is no map info"""
+        if self.__x_coords is not None:
+            return np.column_stack((self.__x_coords, self.__y_coords))
+        else:
+            return None
+
     def image_height(self) -> int:
         return self.__image_height
 
@@ -217,15 +268,73 @@ class Bands:
 
 class BandStatistics(Bands):
 
+    # the number of pixels to process at a time when calculating the statistics
+    __BLOCK_SIZE = 4096
+
     def __init__(self, bands:np.ndarray, labels:List[Tuple[str, str]]=None):
         super().__init__(bands, labels)
-        self.__mean = bands.mean(0)
-        self.__min = bands.min(0)
-        self.__max = bands.max(0)
-        self.__std = bands.std(0)
+        self.__mean, self.__min, self.__max, self.__std = BandStatistics.__calculate(bands)
         self.__mean_plus = self.__mean + self.__std
         self.__mean_minus = self.__mean - self.__std
 
+    @staticmethod
+    def __calculate(bands:np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the mean, min, max and std of each band.  Masked array reductions
+        are much slower than their plain array equivalents so the reductions are done
+        on the underlying data with masked values replaced by values that don't
+        change the result.  Bands that are entirely masked are masked in the result.
+        The pixels are processed in blocks so the temporary arrays stay small no
+        matter how many pixels there are"""
+        data = ma.getdata(bands)
+        # getmask doesn't create a mask array when there isn't one
+        mask = ma.getmask(bands)
+        block_size = BandStatistics.__BLOCK_SIZE
+        blocks = [slice(start, start + block_size) for start in range(0, data.shape[0], block_size)]
+
+        if mask is ma.nomask or not mask.any():
+            mean = data.mean(0)
+            # std() would calculate the mean again so calculate it
+            # here from the mean we already have
+            squares = np.zeros(mean.shape, np.float64)
+            for block in blocks:
+                deviation = data[block] - mean
+                deviation *= deviation
+                squares += deviation.sum(0)
+            return mean, data.min(0), data.max(0), np.sqrt(squares / data.shape[0])
+
+        if data.dtype in OpenSpectraDataTypes.Floats:
+            lowest, highest = -np.inf, np.inf
+        else:
+            type_info = np.iinfo(data.dtype)
+            lowest, highest = type_info.min, type_info.max
+
+        count = np.zeros(data.shape[1:], np.intp)
+        total = np.zeros(data.shape[1:], np.float64)
+        minimum = np.full(data.shape[1:], highest, data.dtype)
+        maximum = np.full(data.shape[1:], lowest, data.dtype)
+        for block in blocks:
+            block_data = data[block]
+            block_valid = ~mask[block]
+            count += block_valid.sum(0)
+            total += np.where(block_valid, block_data, 0).sum(0)
+            np.minimum(minimum, np.where(block_valid, block_data, highest).min(0), out=minimum)
+            np.maximum(maximum, np.where(block_valid, block_data, lowest).max(0), out=maximum)
+
+        # entirely masked bands divide by a zero count, they're masked below
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / count
+            squares = np.zeros(mean.shape, np.float64)
+            for block in blocks:
+                deviation = data[block] - mean
+                np.copyto(deviation, 0, where=mask[block])
+                deviation *= deviation
+                squares += deviation.sum(0)
+            std = np.sqrt(squares / count)
+
+        empty = count == 0
+        return ma.masked_array(mean, mask=empty), ma.masked_array(minimum, mask=empty), \
+            ma.masked_array(maximum, mask=empty), ma.masked_array(std, mask=empty)
+
     def mean(self) -> np.ndarray:
         return self.__mean
 
@@ -255,25 +364,33 @@ class BandStaticsPlotData():
         else:
             self.__title = "Band Stats"
 
-    def mean(self) -> LinePlotData:
-        return LinePlotData(self.__wavelengths, self.__band_stats.mean(),
+        # The plot data only references the statistics so create it once
+        # here rather than every time it's requested
+        self.__mean = LinePlotData(self.__wavelengths, self.__band_stats.mean(),
             "Wavelength", "Magnitude", self.__title, "b", legend="mean")
+        self.__min = LinePlotData(self.__wavelengths, self.__band_stats.min(),
+            "Wavelength", "Magnitude", self.__title, "r", legend="min")
+        self.__max = LinePlotData(self.__wavelengths, self.__band_stats.max(),
+            "Wavelength", "Magnitude", self.__title, "r", legend="max")
+        self.__plus_one_std = LinePlotData(self.__wavelengths, self.__band_stats.plus_one_std(),
+            "Wavelength", "Magnitude", self.__title, "g", legend="std+")
+        self.__minus_one_std = LinePlotData(self.__wavelengths, self.__band_stats.minus_one_std(),
+            "Wavelength", "Magnitude", self.__title, "g", legend="std-")
+
+    def mean(self) -> LinePlotData:
+        return self.__mean
 
     def min(self) -> LinePlotData:
-        return LinePlotData(self.__wavelengths, self.__band_stats.min(),
-            "Wavelength", "Magnitude", self.__title, "r", legend="min")
+        return self.__min
 
     def max(self) -> LinePlotData:
-        return LinePlotData(self.__wavelengths, self.__band_stats.max(),
-            "Wavelength", "Magnitude", self.__title, "r", legend="max")
+        return self.__max
 
     def plus_one_std(self) -> LinePlotData:
-        return LinePlotData(self.__wavelengths, self.__band_stats.plus_one_std(),
-            "Wavelength", "Magnitude", self.__title, "g", legend="std+")
+        return self.__plus_one_std
 
     def minus_one_std(self) -> LinePlotData:
-        return LinePlotData(self.__wavelengths, self.__band_stats.minus_one_std(),
-            "Wavelength", "Magnitude", self.__title, "g", legend="std-")
+        return self.__minus_one_std
 
 
 class OpenSpectraBandTools:
@@ -306,6 +423,17 @@ class OpenSpectraBandTools:
         return LinePlotData(wavelengths, band[0, :], "Wavelength", "Magnitude",
             "Spectrum S-{0}, L-{1}".format(sample + 1, line + 1))
 
+    def spectral_plots(self, lines:np.ndarray, samples:np.ndarray) -> List[LinePlotData]:
+        """Get the spectral plots for a group of pixels with a single read of the file
+        rather than calling spectral_plot for each pixel.  lines and samples are 1
+        dimensional arrays of the same size, the plots are in the same order"""
+        bands = self.__clean_data(self.__file.bands(lines, samples))
+        wavelengths = self.__file.header().wavelengths()
+
+        return [LinePlotData(wavelengths, band, "Wavelength", "Magnitude",
+            "Spectrum S-{0}, L-{1}".format(sample + 1, line + 1))
+            for band, line, sample in zip(bands, lines.tolist(), samples.tolist())]
+
     def band_descriptor(self, band_index:int) -> BandDescriptor:
         header = self.__file.header()
         band_label = header.band_label(band_index)
@@ -351,10 +479,10 @@ class OpenSpectraBandTools:
     def __noise_cleanup(bands:np.ndarray) -> np.ndarray:
         clean_bands = bands
         if clean_bands.dtype in OpenSpectraDataTypes.Floats:
-            min = clean_bands.min()
-            max = clean_bands.max()
-            if np.isnan(min) or np.isnan(max) or np.isinf(min) or np.isinf(max):
-                clean_bands = ma.masked_invalid(clean_bands)
+            # a single pass finds any nan or inf values and doubles as the mask
+            invalid = ~np.isfinite(ma.getdata(clean_bands))
+            if invalid.any():
+                clean_bands = ma.masked_where(invalid, clean_bands, copy=False)
 
         return clean_bands
 
@@ -364,6 +492,9 @@ class OpenSpectraRegionTools:
 
     __LOG:Logger = LogHelper.logger("OpenSpectraRegionTools")
 
+    # the number of rows to format and write at a time when saving a region
+    __BLOCK_SIZE = 4096
+
     def __init__(self, region:RegionOfInterest, band_tools:OpenSpectraBandTools):
         self.__region = region
         self.__band_tools = band_tools
@@ -379,11 +510,9 @@ class OpenSpectraRegionTools:
                 self.__projection += (" " + self.__map_info.projection_area())
             self.__projection += (" " + self.__map_info.datum())
 
-            self.__output_format = "{0},{1},{2},{3}"
             self.__data_header = "sample,line,x_coordinate,y_coordinate"
             self.__has_map_info = True
         else:
-            self.__output_format = "{0},{1}"
             self.__data_header = "sample,line"
 
     def save_region(self, file_name:str=None, text_stream:TextIOBase=None, include_bands:bool=True):
@@ -432,19 +561,32 @@ class OpenSpectraRegionTools:
         out.write("# data:\n")
 
         out.write(self.__get_data_header(bands))
-        band_index:int = 0
-        for r in self.__region:
-            if self.__has_map_info:
-                out.write(
-                    self.__output_format.format(r.x_point() + 1, r.y_point() + 1, r.x_coordinate(), r.y_coordinate()))
-            else:
-                out.write(self.__output_format.format(r.x_point() + 1, r.y_point() + 1))
 
-            if bands is not None:
-                out.write("," + ",".join([str(item) for item in bands.bands(band_index)]) + "\n")
-                band_index += 1
-            else:
-                out.write("\n")
+        # Convert the data to strings a block of rows at a time rather than formatting
+        # point by point, the string conversion matches str() for each value
+        points = self.__region.points_array() + 1
+        coords = self.__region.coords_array() if self.__has_map_info else None
+        band_data = bands.bands() if bands is not None else None
+
+        block_size = OpenSpectraRegionTools.__BLOCK_SIZE
+        for start in range(0, points.shape[0], block_size):
+            block = slice(start, start + block_size)
+            # keep each column as its own list of strings rather than stacking them
+            # into one array that would widen every value to the widest column
+            columns = [points[block].astype(str).tolist()]
+            if coords is not None:
+                columns.append(coords[block].astype(str).tolist())
+
+            if band_data is not None:
+                band_block = band_data[block]
+                band_strings = ma.getdata(band_block).astype(str)
+                band_mask = ma.getmaskarray(band_block)
+                if band_mask.any():
+                    band_strings = np.where(band_mask, str(ma.masked), band_strings)
+                columns.append(band_strings.tolist())
+
+            out.writelines([",".join([item for column in row for item in column]) + "\n"
+                for row in zip(*columns)])
 
     def __get_data_header(self, bands:Bands=None) -> str:
         header:str = self.__data_header
@@ -474,10 +616,14 @@ class OpenSpectraImageTools:
 
 class OpenSpectraHistogramTools:
     """A class for generating histogram data from Images.
-    Note: all indexes are expected to be zero based."""
+    Note: all indexes are expected to be zero based.
+    Note: non contiguous raw band data is copied into a buffer that is reused by
+    later calls, use the returned raw plot data before requesting the next raw histogram."""
 
     def __init__(self, image:Image):
         self.__image = image
+        # buffer reused across bands to flatten non contiguous raw data
+        self.__buffer:np.ndarray = None
         if isinstance(self.__image, GreyscaleImage):
             self.__type = "greyscale"
         elif isinstance(self.__image, RGBImage):
@@ -487,13 +633,15 @@ class OpenSpectraHistogramTools:
 
     def raw_histogram(self, band:Band=None) -> HistogramPlotData:
         """If band is included and the image is Greyscale it is ignores
-        If image is RGB and band is missing an error is raised"""
+        If image is RGB and band is missing an error is raised.
+        Note: when the raw data isn't contiguous the returned y_data is a reused
+        buffer that is overwritten by the next call to raw_histogram"""
 
         if self.__type == "rgb" and band is None:
             raise ValueError("band argument is required when image is RGB")
 
         raw_data = self.__image.raw_data(band)
-        plot_data = OpenSpectraHistogramTools.__get_hist_data(raw_data)
+        plot_data = OpenSpectraHistogramTools.__get_hist_data(self.__flatten(raw_data))
         plot_data.x_label = "Magnitude"
         plot_data.y_label = "Count  "
         plot_data.title = "Raw " + self.__image.label(band)
@@ -507,32 +655,50 @@ class OpenSpectraHistogramTools:
         if self.__type == "rgb" and band is None:
             raise ValueError("band argument is required when image is RGB")
 
-        image_data = self.__image.image_data(band)
-        plot_data = OpenSpectraHistogramTools.__get_hist_data(image_data)
+        # the image data is already clipped to the display values and nothing is masked
+        # so use the plain data rather than the masked array, it's always contiguous
+        image_data = ma.getdata(self.__image.image_data(band))
+        plot_data = OpenSpectraHistogramTools.__get_hist_data(image_data.ravel())
         plot_data.x_label = "Pixel Values"
         plot_data.y_label = "Count"
         plot_data.title = "Adjusted " + self.__image.label(band)
         plot_data.color = "b"
         return plot_data
 
+    def __flatten(self, data:np.ndarray) -> np.ndarray:
+        # contiguous data can be flattened without copying, masked data
+        # must be copied with ravel to keep its mask
+        if data.flags.c_contiguous or ma.isMaskedArray(data):
+            return data.ravel()
+
+        if self.__buffer is None or self.__buffer.shape != data.shape or self.__buffer.dtype != data.dtype:
+            self.__buffer = np.empty(data.shape, data.dtype)
+
+        np.copyto(self.__buffer, data)
+        return self.__buffer.ravel()
+
     @staticmethod
     def __get_hist_data(data:np.ndarray) -> HistogramPlotData:
+        """Expects data to already be flattened"""
         type = data.dtype
         if type in OpenSpectraDataTypes.Ints:
-            bins = data.max() - data.min()
+            min = data.min()
+            max = data.max()
+            # convert first so the subtraction can't overflow the data type
+            bins = int(max) - int(min)
             if bins == 0:
                 bins = 255
                 x_range = (0, 255)
             else:
-                x_range = (data.min(), data.max())
-            return HistogramPlotData(x_range, data.flatten(), bins=bins)
+                x_range = (min, max)
         elif type in OpenSpectraDataTypes.Floats:
             x_range = (data.min(), data.max())
             bins = OpenSpectraProperties.get_property("FloatBins", 512)
-            return HistogramPlotData(x_range, data.flatten(), bins=bins)
         else:
             raise TypeError("Data with type {0} is not supported".format(type))
 
+        return HistogramPlotData(x_range, data, bins=bins)
+
 
 class CubeParams:
     """A class for defining the dimension and interleave of a new data cube
@@ -257,18 +257,24 @@ class OpenSpectraHeader:
                 y_pixels:Union[int, float, np.ndarray]) ->\
                 Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
 
-            x_coords = (x_pixels - (self.__x_reference_pixel - 1)) * self.__x_pixel_size
-            y_coords = (y_pixels - (self.__y_reference_pixel - 1)) * self.__y_pixel_size
+            # Allocate the result once and do the rest of the calculation
+            # in place, for scalar arguments the in place operators just rebind
+            x_coords = np.subtract(x_pixels, self.__x_reference_pixel - 1, dtype=np.float64)
+            x_coords *= self.__x_pixel_size
+            y_coords = np.subtract(y_pixels, self.__y_reference_pixel - 1, dtype=np.float64)
+            y_coords *= self.__y_pixel_size
 
-            x_coords_rot = x_coords
-            y_coords_rot = y_coords
             if self.__rotation is not None:
                 # This implementation is for counterclockwise rotation
                 x_coords_rot = x_coords * cos(self.__rotation) + y_coords * sin(self.__rotation)
                 y_coords_rot = -x_coords * sin(self.__rotation) + y_coords * cos(self.__rotation)
+                x_coords = x_coords_rot
+                y_coords = y_coords_rot
 
-            x_coords = x_coords_rot + self.__x_zero_coordinate
-            y_coords = self.__y_zero_coordinate - y_coords_rot
+            x_coords += self.__x_zero_coordinate
+            # y coordinates are the y zero coordinate minus the offset
+            y_coords *= -1.0
+            y_coords += self.__y_zero_coordinate
 
             return x_coords, y_coords
 
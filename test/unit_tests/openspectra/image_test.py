@@ -7,6 +7,7 @@ import numpy as np
 
 from openspectra.image import BandDescriptor, BandImageAdjuster
 from openspectra.openspectra_file import OpenSpectraFileFactory
+from openspectra.utils import OpenSpectraProperties
 
 
 class BandDescriptorTest(unittest.TestCase):
@@ -58,6 +59,57 @@ class BandImageAdjusterTest(unittest.TestCase):
         self.assertTrue(np.ma.isMaskedArray(adjust_image))
         self.assertEqual(adjust_image[181, 326], 0)
 
+    def test_float_cutoffs(self):
+        band = np.random.RandomState(42).normal(0.25, 0.05, (350, 400)).astype(np.float32)
+        band_adjuster = BandImageAdjuster(band)
+
+        # expected cutoffs calculated from the float histogram scaled to the bins
+        max_bin = OpenSpectraProperties.get_property("FloatBins", 512) - 1
+        band_min = band.min()
+        band_max = band.max()
+        hist_scaled = np.floor((band - band_min) / (band_max - band_min) * max_bin)
+        low, high = np.percentile(hist_scaled, (2, 98))
+        self.assertEqual(band_adjuster.low_cutoff(), (low / max_bin * (band_max - band_min)) + band_min)
+        self.assertEqual(band_adjuster.high_cutoff(), (high / max_bin * (band_max - band_min)) + band_min)
+
+        band_adjuster.adjust_by_percentage(10, 75)
+        low, high = np.percentile(hist_scaled, (10, 75))
+        self.assertEqual(band_adjuster.low_cutoff(), (low / max_bin * (band_max - band_min)) + band_min)
+        self.assertEqual(band_adjuster.high_cutoff(), (high / max_bin * (band_max - band_min)) + band_min)
+
+    def test_clipped_values(self):
+        band = np.array([[-np.inf, 0.0, 0.1, 0.2, 0.25],
+                         [0.3, 0.4, 0.5, np.inf, np.nan],
+                         [-999.0, 0.15, 0.35, 0.45, 0.05]], np.float32)
+        band_adjuster = BandImageAdjuster(band, -999.0)
+        band_adjuster.set_low_cutoff(0.1)
+        band_adjuster.set_high_cutoff(0.4)
+        band_adjuster.adjust()
+
+        expected = np.array([[0, 0, 0, 85, 128],
+                             [170, 255, 255, 255, 0],
+                             [0, 42, 213, 255, 0]], np.uint8)
+        adjust_image = band_adjuster.adjusted_data()
+        self.assertTrue(np.ma.isMaskedArray(adjust_image))
+        self.assertFalse(adjust_image.mask.any())
+        self.assertEqual(adjust_image.dtype, np.uint8)
+        self.assertTrue(np.array_equal(adjust_image, expected))
+
+        # inverted cutoffs threshold the band at the high cutoff
+        band_adjuster.set_low_cutoff(0.4)
+        band_adjuster.set_high_cutoff(0.2)
+        band_adjuster.adjust()
+
+        expected = np.array([[0, 0, 0, 255, 255],
+                             [255, 255, 255, 255, 0],
+                             [0, 0, 255, 255, 0]], np.uint8)
+        self.assertTrue(np.array_equal(band_adjuster.adjusted_data(), expected))
+
+        band_adjuster.set_low_cutoff(0.1)
+        band_adjuster.set_high_cutoff(0.1)
+        band_adjuster.adjust()
+        self.assertTrue(np.array_equal(band_adjuster.adjusted_data(), np.zeros(band.shape, np.uint8)))
+
 
 class RGBImageAdjusterTest(unittest.TestCase):
     # TODO
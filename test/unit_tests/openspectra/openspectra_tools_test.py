@@ -9,9 +9,9 @@ from typing import List
 
 import numpy as np
 
-from openspectra.image import BandDescriptor
+from openspectra.image import BandDescriptor, GreyscaleImage, RGBImage, Band
 from openspectra.openspecrtra_tools import RegionOfInterest, OpenSpectraBandTools, OpenSpectraRegionTools, CubeParams, \
-    SubCubeTools
+    SubCubeTools, OpenSpectraHistogramTools
 from openspectra.openspectra_file import OpenSpectraHeader, OpenSpectraFileFactory
 
 
@@ -77,6 +77,84 @@ class RegionOfInterestTest(unittest.TestCase):
 
         self.assertTrue(point_checked)
 
+    def test_arrays(self):
+        roi = RegionOfInterest(self.__points, 1.0, 1.0, 1000, 1000,
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "test")
+        self.assertTrue(np.array_equal(roi.points_array(), self.__points))
+        self.assertIsNone(roi.coords_array())
+
+        map_info = OpenSpectraHeader.MapInfo(["UTM", "1.000", "1.000",
+                    "50000.000", "4000000.000", "2.0000000000e+001", "2.0000000000e+001",
+                    "4", "North", "WGS-84", "units=Meters", "rotation=30.00000000"])
+        roi.set_map_info(map_info)
+        coords = roi.coords_array()
+        self.assertEqual(coords.shape, (9, 2))
+
+        index = 0
+        for r in roi:
+            self.assertEqual(roi.points_array()[index, 0], r.x_point())
+            self.assertEqual(roi.points_array()[index, 1], r.y_point())
+            self.assertEqual(coords[index, 0], r.x_coordinate())
+            self.assertEqual(coords[index, 1], r.y_coordinate())
+            index += 1
+
+        self.assertEqual(index, 9)
+
+    def test_zoom_factors(self):
+        roi = RegionOfInterest(self.__points, 2.0, 2.0, 1000, 1000,
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "test")
+        self.assertTrue(np.array_equal(roi.x_points(), np.array([173, 173, 174, 174])))
+        self.assertTrue(np.array_equal(roi.y_points(), np.array([102, 103, 102, 103])))
+        self.assertEqual(roi.x_points().dtype, np.intp)
+        self.assertEqual(roi.y_points().dtype, np.intp)
+
+        roi = RegionOfInterest(self.__points, 2.0, 1.0, 1000, 1000,
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "test")
+        self.assertTrue(np.array_equal(roi.x_points(), np.array([173, 173, 173, 174, 174, 174])))
+        self.assertTrue(np.array_equal(roi.y_points(), np.array([205, 206, 207, 205, 206, 207])))
+
+        roi = RegionOfInterest(self.__points, 0.5, 0.5, 1000, 1000,
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "test")
+        self.assertEqual(roi.x_points().size, 9)
+        self.assertEqual(roi.x_points()[0], 694)
+        self.assertEqual(roi.y_points()[8], 414)
+
+        # scaled points past the int16 range shouldn't overflow
+        roi = RegionOfInterest(np.array([[40000, 70000]]), 0.5, 0.25, 100000, 300000,
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "test")
+        self.assertEqual(roi.x_points()[0], 80000)
+        self.assertEqual(roi.y_points()[0], 280000)
+
+        # scaling should match floor(point / zoom factor) for any zoom factor
+        points = np.array([[3, -3], [30, 7]])
+        roi = RegionOfInterest(points, 0.1, 2.0, 1000, 1000,
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "test")
+        self.assertTrue(np.array_equal(roi.x_points(), np.array([30, 300])))
+        self.assertTrue(np.array_equal(roi.y_points(), np.array([-2, 3])))
+        self.assertEqual(roi.y_points().dtype, np.intp)
+
+    def test_from_points(self):
+        x_points = np.ascontiguousarray(self.__points[:, 0])
+        y_points = np.ascontiguousarray(self.__points[:, 1])
+        roi = RegionOfInterest.from_points(x_points, y_points, 1.0, 1.0, 1000, 1000,
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "test")
+        self.assertTrue(np.array_equal(roi.points_array(), self.__points))
+        self.assertEqual(roi.display_name(), "test")
+        self.assertEqual(roi.description(), "file_name - band_label - wavelength_label")
+
+        roi = RegionOfInterest.from_points(x_points, y_points, 2.0, 2.0, 1000, 1000,
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "test")
+        self.assertTrue(np.array_equal(roi.x_points(), np.array([173, 173, 174, 174])))
+        self.assertTrue(np.array_equal(roi.y_points(), np.array([102, 103, 102, 103])))
+
+        with self.assertRaises(ValueError):
+            RegionOfInterest.from_points(self.__points, y_points, 1.0, 1.0, 1000, 1000,
+                BandDescriptor("file_name", "band_label", "wavelength_label"))
+
+        with self.assertRaises(ValueError):
+            RegionOfInterest.from_points(x_points, y_points[1:], 1.0, 1.0, 1000, 1000,
+                BandDescriptor("file_name", "band_label", "wavelength_label"))
+
 
 class OpenSpectraRegionToolsTest(unittest.TestCase):
 
@@ -225,7 +303,79 @@ class OpenSpectraRegionToolsTest(unittest.TestCase):
 
         output.close()
 
+    def test_save_no_map(self):
+        test_file = "test/unit_tests/resources/cup95_eff_fixed_offset_1k"
+        os_file = OpenSpectraFileFactory.create_open_spectra_file(test_file)
+        os_header = os_file.header()
+        band_tools = OpenSpectraBandTools(os_file)
+
+        roi = RegionOfInterest(self.__points, 1.0, 1.0, os_header.lines(), os_header.samples(),
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "region_name")
+
+        region_tools = OpenSpectraRegionTools(roi, band_tools)
+        output = io.StringIO()
+        region_tools.save_region(text_stream=output, include_bands=True)
+
+        lines = output.getvalue().split("\n")
+        self.assertEqual(lines[6], "# description:file_name - band_label - wavelength_label")
+        self.assertEqual(lines[7], "# data:")
+        self.assertTrue(lines[8].startswith("sample,line,Band 172-1.990800,"))
+        self.assertEqual(len(lines), 19)
+        self.assertEqual(lines[18], "")
+
+        x_expected = 348
+        y_expected = 206
+        for index in range(9, len(lines) - 1):
+            line = lines[index].split(",")
+            self.assertEqual(len(line), 52)
+            self.assertEqual(int(line[0]), x_expected)
+            self.assertEqual(int(line[1]), y_expected)
+
+            raw_bands = os_file.bands(y_expected - 1, x_expected - 1)
+            for band_index in range(0, 50):
+                if band_index in (38, 39, 40, 41, 42):
+                    # bad bands are masked
+                    self.assertEqual(line[band_index + 2], "--")
+                else:
+                    self.assertEqual(int(line[band_index + 2]), raw_bands[0, band_index])
+
+            if y_expected == 208:
+                y_expected = 206
+                x_expected += 1
+            else:
+                y_expected += 1
+
+        output.close()
+
     # TODO finish
+    def test_save_large_region(self):
+        test_file = "test/unit_tests/resources/cup95_eff_fixed"
+        os_file = OpenSpectraFileFactory.create_open_spectra_file(test_file)
+        os_header = os_file.header()
+        band_tools = OpenSpectraBandTools(os_file)
+
+        # enough points that the data is written in several blocks
+        y_points, x_points = np.mgrid[0:100, 0:90]
+        roi = RegionOfInterest.from_points(x_points.ravel(), y_points.ravel(), 1.0, 1.0,
+            os_header.lines(), os_header.samples(),
+            BandDescriptor("file_name", "band_label", "wavelength_label"), "region_name")
+
+        region_tools = OpenSpectraRegionTools(roi, band_tools)
+        output = io.StringIO()
+        region_tools.save_region(text_stream=output, include_bands=True)
+
+        lines = output.getvalue().split("\n")
+        self.assertEqual(len(lines), 9000 + 9 + 1)
+        self.assertEqual(lines[-1], "")
+
+        for x, y in ((1, 1), (90, 46), (1, 47), (90, 100)):
+            point_index = (y - 1) * 90 + x - 1
+            line = lines[9 + point_index].split(",")
+            self.assertEqual(int(line[0]), x)
+            self.assertEqual(int(line[1]), y)
+            raw_bands = os_file.bands(y - 1, x - 1)
+            self.assertEqual(line[2:], [str(item) for item in raw_bands[0]])
+
     def test_save_rgb(self):
         pass
 
@@ -280,6 +430,157 @@ class OpenSpectraBandToolsTest(unittest.TestCase):
                 self.assertTrue(band_data[0, index] is not np.ma.masked)
                 self.assertEqual(band_data[0, index], raw_bands[0, index])
 
+    def test_band_statistics(self):
+        """Test that the band statistics match the equivalent numpy calculations"""
+        lines = np.arange(175, 185).repeat(10)
+        samples = np.tile(np.arange(320, 330), 10)
+        band_data = self.__band_tools.bands(lines, samples).bands()
+        band_stats = self.__band_tools.band_statistics(lines, samples)
+
+        self.assertTrue(np.ma.allclose(band_stats.mean(), band_data.mean(0)))
+        self.assertTrue(np.ma.allclose(band_stats.min(), band_data.min(0)))
+        self.assertTrue(np.ma.allclose(band_stats.max(), band_data.max(0)))
+        self.assertTrue(np.ma.allclose(band_stats.std(), band_data.std(0)))
+        self.assertTrue(np.ma.allclose(band_stats.plus_one_std(), band_data.mean(0) + band_data.std(0)))
+        self.assertTrue(np.ma.allclose(band_stats.minus_one_std(), band_data.mean(0) - band_data.std(0)))
+
+        # bad bands should remain masked in the statistics
+        for index in (38, 39, 40, 41, 42):
+            self.assertTrue(band_stats.mean()[index] is np.ma.masked)
+            self.assertTrue(band_stats.std()[index] is np.ma.masked)
+
+    def test_spectral_plots(self):
+        lines = np.array([10, 181, 181, 300])
+        samples = np.array([10, 326, 327, 50])
+        spectral_plots = self.__band_tools.spectral_plots(lines, samples)
+        self.assertEqual(len(spectral_plots), 4)
+
+        for plot_data, line, sample in zip(spectral_plots, lines.tolist(), samples.tolist()):
+            expected = self.__band_tools.spectral_plot(line, sample)
+            self.assertEqual(plot_data.title, expected.title)
+            self.assertTrue(np.array_equal(plot_data.x_data, expected.x_data))
+            self.assertTrue(np.array_equal(plot_data.y_data.mask, expected.y_data.mask))
+            self.assertTrue(np.ma.allequal(plot_data.y_data, expected.y_data))
+
+        self.assertEqual(spectral_plots[1].title, "Spectrum S-327, L-182")
+
+    def test_statistics_plot(self):
+        lines = np.arange(175, 185).repeat(10)
+        samples = np.tile(np.arange(320, 330), 10)
+        band_stats = self.__band_tools.band_statistics(lines, samples)
+        stats_plot = self.__band_tools.statistics_plot(lines, samples, "Region: test")
+
+        mean_plot = stats_plot.mean()
+        self.assertIs(mean_plot, stats_plot.mean())
+        self.assertEqual(mean_plot.title, "Region: test")
+        self.assertEqual(mean_plot.legend, "mean")
+        self.assertTrue(np.array_equal(mean_plot.x_data, self.__test_file.header().wavelengths()))
+        self.assertTrue(np.ma.allclose(mean_plot.y_data, band_stats.mean()))
+
+        self.assertEqual(stats_plot.min().legend, "min")
+        self.assertEqual(stats_plot.max().legend, "max")
+        self.assertEqual(stats_plot.plus_one_std().legend, "std+")
+        self.assertEqual(stats_plot.minus_one_std().legend, "std-")
+        self.assertTrue(np.ma.allclose(stats_plot.plus_one_std().y_data, band_stats.plus_one_std()))
+
+
+class OpenSpectraBandToolsFloatTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # create a small bil float file that contains nan and inf values
+        self.__test_file_name = "test/unit_tests/resources/float_noise_test"
+        data = np.arange(2 * 4 * 3, dtype=np.float32).reshape((2, 4, 3)) / 100
+        data[0, 1, 1] = np.nan
+        data[1, 2, 2] = np.inf
+        data[1, 3, 0] = -np.inf
+        data.tofile(self.__test_file_name)
+
+        with open(self.__test_file_name + ".hdr", "w") as header_file:
+            header_file.write("ENVI\n"
+                              "samples = 3\n"
+                              "lines = 2\n"
+                              "bands = 4\n"
+                              "header offset = 0\n"
+                              "file type = ENVI Standard\n"
+                              "data type = 4\n"
+                              "interleave = bil\n"
+                              "byte order = 0\n"
+                              "wavelength = {1.0, 2.0, 3.0, 4.0}\n")
+
+        self.__test_file = OpenSpectraFileFactory.create_open_spectra_file(self.__test_file_name)
+        self.__band_tools = OpenSpectraBandTools(self.__test_file)
+
+    def tearDown(self) -> None:
+        for file_name in (self.__test_file_name, self.__test_file_name + ".hdr"):
+            if os.path.isfile(file_name):
+                os.remove(file_name)
+
+    def test_invalid_values(self):
+        """Test that nan and inf values are masked"""
+        band_data = self.__band_tools.bands(0, 1).bands()
+        self.assertTrue(np.ma.isMaskedArray(band_data))
+        self.assertTrue(np.array_equal(band_data.mask, np.array([[False, True, False, False]])))
+
+        band_data = self.__band_tools.bands(np.array([1, 1]), np.array([2, 0])).bands()
+        self.assertTrue(np.array_equal(band_data.mask, np.array([
+            [False, False, True, False],
+            [False, False, False, True]])))
+
+        # valid data shouldn't be masked at all
+        band_data = self.__band_tools.bands(0, 0).bands()
+        self.assertFalse(np.ma.is_masked(band_data))
+
+    def test_invalid_statistics(self):
+        band_stats = self.__band_tools.band_statistics(np.array([0, 0, 1, 1]), np.array([0, 1, 1, 2]))
+        self.assertTrue(np.all(np.isfinite(band_stats.mean())))
+        self.assertTrue(np.all(np.isfinite(band_stats.std())))
+        self.assertAlmostEqual(band_stats.mean()[1], (0.03 + 0.16 + 0.17) / 3, places=6)
+        self.assertAlmostEqual(band_stats.max()[2], 0.19, places=6)
+
+
+class OpenSpectraHistogramToolsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        test_file = "test/unit_tests/resources/cup95_eff_fixed"
+        self.__test_file = OpenSpectraFileFactory.create_open_spectra_file(test_file)
+        self.__raw_image = self.__test_file.raw_image(5)
+        self.__image = GreyscaleImage(self.__raw_image,
+            BandDescriptor("file_name", "band_label", "wavelength_label"))
+        self.__histogram_tools = OpenSpectraHistogramTools(self.__image)
+
+    def test_raw_histogram(self):
+        raw_hist = self.__histogram_tools.raw_histogram()
+        self.assertEqual(raw_hist.y_data.ndim, 1)
+        self.assertTrue(np.array_equal(raw_hist.y_data, self.__raw_image.flatten()))
+        self.assertEqual(raw_hist.x_data, (self.__raw_image.min(), self.__raw_image.max()))
+        self.assertEqual(raw_hist.bins, int(self.__raw_image.max()) - int(self.__raw_image.min()))
+        self.assertEqual(raw_hist.lower_limit(), self.__image.low_cutoff())
+        self.assertEqual(raw_hist.upper_limit(), self.__image.high_cutoff())
+
+    def test_adjusted_histogram(self):
+        image_hist = self.__histogram_tools.adjusted_histogram()
+        image_data = self.__image.image_data()
+        self.assertEqual(image_hist.y_data.ndim, 1)
+        self.assertTrue(np.array_equal(image_hist.y_data, image_data.flatten()))
+        self.assertFalse(np.ma.isMaskedArray(image_hist.y_data))
+        self.assertEqual(image_hist.bins, 255)
+
+    def test_rgb_raw_histogram(self):
+        raw_images = [self.__test_file.raw_image(band) for band in (5, 15, 25)]
+        image = RGBImage(raw_images[0], raw_images[1], raw_images[2],
+            BandDescriptor("file_name", "red_label", "wavelength_label"),
+            BandDescriptor("file_name", "green_label", "wavelength_label"),
+            BandDescriptor("file_name", "blue_label", "wavelength_label"))
+        histogram_tools = OpenSpectraHistogramTools(image)
+
+        # the bands in a bil file aren't contiguous so they have to be copied to be flattened
+        self.assertFalse(raw_images[0].flags.c_contiguous)
+        for band, raw_image in zip((Band.RED, Band.GREEN, Band.BLUE), raw_images):
+            raw_hist = histogram_tools.raw_histogram(band)
+            self.assertEqual(raw_hist.y_data.ndim, 1)
+            self.assertTrue(np.array_equal(raw_hist.y_data, raw_image.flatten()))
+            self.assertEqual(raw_hist.x_data, (raw_image.min(), raw_image.max()))
+
 
 class SubCubeToolsTest(unittest.TestCase):
 